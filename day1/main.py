@@ -1,5 +1,18 @@
+import os
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from typing import BinaryIO
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+
+import numpy as np
 from devtools import debug
 
+DIAL_START: int = 50
+DIAL_SIZE: int = 100
+CHUNK_SIZE: int = 1 << 20
+POWERS_OF_TEN = 10 ** np.arange(19, dtype=np.int64)
+
 
 def readFile() -> list[str]:
     """Reads input.txt and returns an array of strings of each line in the file."""
@@ -9,11 +22,12 @@ def readFile() -> list[str]:
 
 def main():
     print("Hello from day1!")
-    lines: list[str] = readFile()
-    print(f"Read {len(lines)} lines from input.txt")
-    password: int = turnDial(instructions=lines)
-    print(f"Part1 password: {turnDial(instructions=lines)}")
-    print(f"Part2 password: {turnDial2(instructions=lines)}")
+    count, part1, part2 = 0, 0, 0
+    for count, part1, part2 in turnDialStream():
+        pass
+    print(f"Read {count} lines from input.txt")
+    print(f"Part1 password: {part1}")
+    print(f"Part2 password: {part2}")
 
 def turnDial(instructions: list[str]) -> int:
     dialPos: int = 50
@@ -21,7 +35,6 @@ def turnDial(instructions: list[str]) -> int:
     for line in instructions:
         direction = line[0]
         amount = int(line[1:])
-        debug(dialPos, direction, amount)
         if direction == 'L':
             dialPos -= amount 
         elif direction == 'R':
@@ -52,9 +65,467 @@ def turnDial2(instructions: list[str]) -> int:
         dialPos %= 100
         if dialPos == 0:
             password += 1
-        debug(direction, amount, dialPos, password)
         
     return password
 
+# Called as trace(step, direction, amount, dialPos, part1, part2) after each traced step.
+DialTrace = Callable[[int, str, int, int, int, int], None]
+
+
+def debugTrace(step: int, direction: str, amount: int, dialPos: int, part1: int, part2: int) -> None:
+    """Trace hook that prints each step with devtools."""
+    debug(step, direction, amount, dialPos, part1, part2)
+
+
+def turnDials(
+    instructions: list[str], trace: DialTrace | None = None, traceEvery: int = 1
+) -> tuple[int, int]:
+    """
+    Computes the part 1 and part 2 passwords in a single pass over the instructions.
+
+    When trace is given it is called on every traceEvery-th step; without it the loop
+    carries no tracing code at all.
+    """
+    if trace is not None:
+        return _turnDialsTraced(instructions, trace, traceEvery)
+    dialPos: int = DIAL_START
+    part1: int = 0
+    part2: int = 0
+    for line in instructions:
+        direction = line[0]
+        turns, remainder = divmod(int(line[1:]), DIAL_SIZE)
+        part2 += turns
+        if direction == 'L':
+            if dialPos != 0 and remainder > dialPos:
+                part2 += 1
+            dialPos = (dialPos - remainder) % DIAL_SIZE
+        elif direction == 'R':
+            if dialPos != 0 and remainder > DIAL_SIZE - dialPos:
+                part2 += 1
+            dialPos = (dialPos + remainder) % DIAL_SIZE
+        if dialPos == 0:
+            part1 += 1
+            part2 += 1
+    return part1, part2
+
+
+def _turnDialsTraced(instructions: list[str], trace: DialTrace, traceEvery: int) -> tuple[int, int]:
+    """Same loop as turnDials, calling trace on a countdown so sampling costs no modulo per step."""
+    if traceEvery < 1:
+        raise ValueError("traceEvery must be at least 1")
+    dialPos: int = DIAL_START
+    part1: int = 0
+    part2: int = 0
+    countdown: int = traceEvery
+    for step, line in enumerate(instructions):
+        direction = line[0]
+        amount = int(line[1:])
+        turns, remainder = divmod(amount, DIAL_SIZE)
+        part2 += turns
+        if direction == 'L':
+            if dialPos != 0 and remainder > dialPos:
+                part2 += 1
+            dialPos = (dialPos - remainder) % DIAL_SIZE
+        elif direction == 'R':
+            if dialPos != 0 and remainder > DIAL_SIZE - dialPos:
+                part2 += 1
+            dialPos = (dialPos + remainder) % DIAL_SIZE
+        if dialPos == 0:
+            part1 += 1
+            part2 += 1
+        countdown -= 1
+        if countdown == 0:
+            trace(step, direction, amount, dialPos, part1, part2)
+            countdown = traceEvery
+    return part1, part2
+
+
+def parseInstructions(data: bytes) -> np.ndarray:
+    """Parses raw L/R instruction bytes into one signed integer array, L negative and R positive."""
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    starts = np.flatnonzero((buffer == ord("L")) | (buffer == ord("R")))
+    digits = np.flatnonzero((buffer >= ord("0")) & (buffer <= ord("9")))
+    if starts.size == 0:
+        if digits.size:
+            raise ValueError("Amount found before any direction")
+        return np.zeros(0, dtype=np.int64)
+    line = np.searchsorted(starts, digits, side="right") - 1
+    if line.size and line[0] < 0:
+        raise ValueError("Amount found before any direction")
+    counts = np.bincount(line, minlength=starts.size)
+    if not counts.all():
+        raise ValueError("Instruction without an amount")
+    offsets = np.cumsum(counts) - counts
+    exponents = counts[line] - 1 - (np.arange(digits.size) - offsets[line])
+    values = (buffer[digits] - ord("0")).astype(np.int64) * POWERS_OF_TEN[exponents]
+    amounts = np.add.reduceat(values, offsets)
+    return np.where(buffer[starts] == ord("L"), -amounts, amounts)
+
+
+def readMoves(filename: str = "input.txt") -> np.ndarray:
+    """Reads an instruction file straight into a signed integer array."""
+    with open(filename, "rb") as file:
+        return parseInstructions(file.read())
+
+
+def parseLines(lines: list[str]) -> np.ndarray:
+    """Parses instruction lines such as those returned by readFile() into a signed integer array."""
+    return parseInstructions("\n".join(lines).encode())
+
+
+def _dialKernel(
+    moves: np.ndarray, dialPos: np.ndarray, sizes, valid: np.ndarray | None = None
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Applies rows of signed moves, one row per dial, starting at dialPos.
+
+    moves has shape (rows, n), or (1, n) to run the same moves on every dial; dialPos has
+    shape (rows,) and sizes is a scalar or a (rows, 1) column. Padding moves must be zero
+    and masked out with valid. Returns the final positions, the number of moves that land
+    on zero (part 1) and the number of times each dial points at zero, counted exactly as
+    turnDial2 does (part 2).
+    """
+    amounts = np.abs(moves)
+    positions = (dialPos[:, None] + np.cumsum(moves % sizes, axis=1)) % sizes
+    previous = np.concatenate((dialPos[:, None], positions[:, :-1]), axis=1)
+    remainders = amounts % sizes
+    crossed = (previous != 0) & np.where(moves < 0, remainders > previous, remainders > sizes - previous)
+    landed = positions == 0
+    if valid is not None:
+        landed &= valid
+    landings = np.count_nonzero(landed, axis=1)
+    crossings = (amounts // sizes).sum(axis=1) + np.count_nonzero(crossed, axis=1) + landings
+    return positions[:, -1], landings, crossings
+
+
+def _evaluateMoves(moves: np.ndarray, dialPos: int, size: int) -> tuple[int, int, int]:
+    """
+    Applies a block of signed moves starting at dialPos.
+
+    Returns the final dial position, the number of moves that land on zero (part 1)
+    and the number of times the dial points at zero, counted exactly as turnDial2 does (part 2).
+    """
+    if moves.size == 0:
+        return dialPos, 0, 0
+    positions, landings, crossings = _dialKernel(moves[None, :], np.array([dialPos]), size)
+    return int(positions[0]), int(landings[0]), int(crossings[0])
+
+
+def _evaluateChunked(
+    moves: np.ndarray, start: int, size: int, chunkSize: int
+) -> tuple[int, int]:
+    """Runs _evaluateMoves over fixed-size slices so temporaries stay bounded for huge logs."""
+    dialPos, part1, part2 = start, 0, 0
+    for offset in range(0, moves.size, chunkSize):
+        dialPos, landings, crossings = _evaluateMoves(moves[offset : offset + chunkSize], dialPos, size)
+        part1 += landings
+        part2 += crossings
+    return part1, part2
+
+
+def turnDialVectorized(
+    moves: np.ndarray, start: int = DIAL_START, size: int = DIAL_SIZE, chunkSize: int = CHUNK_SIZE
+) -> int:
+    """Array equivalent of turnDial: counts the moves that leave the dial on zero."""
+    return _evaluateChunked(moves, start, size, chunkSize)[0]
+
+
+def turnDial2Vectorized(
+    moves: np.ndarray, start: int = DIAL_START, size: int = DIAL_SIZE, chunkSize: int = CHUNK_SIZE
+) -> int:
+    """Array equivalent of turnDial2: counts every time the dial points at zero."""
+    return _evaluateChunked(moves, start, size, chunkSize)[1]
+
+
+def turnDialBatch(
+    sequences: Sequence[np.ndarray],
+    sizes: int | Sequence[int] = DIAL_SIZE,
+    starts: int | Sequence[int] = DIAL_START,
+    chunkSize: int = 1 << 12,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Evaluates many move sequences at once, each with its own dial size and start position.
+
+    Each column block of chunkSize moves is padded into a 2D array holding only the sequences
+    that reach it, so memory is bounded by the block and the Python overhead is per block rather
+    than per instruction. Returns the part 1 and part 2 passwords as arrays in the order of
+    sequences.
+    """
+    count = len(sequences)
+    sizes = np.broadcast_to(np.asarray(sizes, dtype=np.int64), (count,))[:, None]
+    dialPos = np.broadcast_to(np.asarray(starts, dtype=np.int64), (count,)).copy()
+    lengths = np.array([len(moves) for moves in sequences], dtype=np.int64)
+
+    part1 = np.zeros(count, dtype=np.int64)
+    part2 = np.zeros(count, dtype=np.int64)
+    for offset in range(0, int(lengths.max(initial=0)), chunkSize):
+        # Only sequences that reach this block are padded into it
+        rows = np.flatnonzero(lengths > offset)
+        moves = np.zeros((rows.size, min(chunkSize, int(lengths[rows].max()) - offset)), dtype=np.int64)
+        for i, row in enumerate(rows):
+            block = sequences[row][offset : offset + chunkSize]
+            moves[i, : len(block)] = block
+        valid = (offset + np.arange(moves.shape[1]))[None, :] < lengths[rows, None]
+        dialPos[rows], landings, crossings = _dialKernel(moves, dialPos[rows], sizes[rows], valid)
+        part1[rows] += landings
+        part2[rows] += crossings
+    return part1, part2
+
+
+class DialSummary:
+    """
+    Effect of a block of instructions for every possible starting position.
+
+    ends[s] is where the dial stops when the block starts at s, and landings[s] / crossings[s]
+    are the part 1 / part 2 counts the block contributes from that start. Summaries of
+    consecutive blocks combine with then(), which is associative.
+    """
+
+    def __init__(self, ends: np.ndarray, landings: np.ndarray, crossings: np.ndarray):
+        self.ends = ends
+        self.landings = landings
+        self.crossings = crossings
+
+    @property
+    def size(self) -> int:
+        return self.ends.size
+
+    @classmethod
+    def identity(cls, size: int = DIAL_SIZE) -> "DialSummary":
+        """Summary of an empty block."""
+        return cls(np.arange(size), np.zeros(size, dtype=np.int64), np.zeros(size, dtype=np.int64))
+
+    def then(self, other: "DialSummary") -> "DialSummary":
+        """Summary of this block followed by other."""
+        return DialSummary(
+            other.ends[self.ends],
+            self.landings + other.landings[self.ends],
+            self.crossings + other.crossings[self.ends],
+        )
+
+    def passwords(self, start: int = DIAL_START) -> tuple[int, int]:
+        """Part 1 and part 2 passwords when the block starts at start."""
+        return int(self.landings[start]), int(self.crossings[start])
+
+
+def summarizeMoves(moves: np.ndarray, size: int = DIAL_SIZE) -> DialSummary:
+    """
+    Builds the DialSummary of a block of signed moves without simulating each start.
+
+    The dial position is always start + offset, so every count only depends on histograms of the
+    offsets: landings come from where the block stops, and turnDial2's extra crossing from the
+    offset before each move paired with its remainder.
+    """
+    if moves.size == 0:
+        return DialSummary.identity(size)
+    offsets = np.cumsum(moves % size) % size
+    before = np.concatenate(([0], offsets[:-1]))
+    remainders = np.abs(moves) % size
+    left = (moves < 0).astype(np.int64)
+    starts = np.arange(size)
+    landed = np.bincount(offsets, minlength=size)
+    landings = landed[(-starts) % size]
+
+    pairs = np.bincount((left * size + before) * size + remainders, minlength=2 * size * size)
+    pairs = pairs.reshape(2, size, size)
+    position = starts[:, None]
+    remainder = starts[None, :]
+    crossesRight = (position != 0) & (remainder > size - position)
+    crossesLeft = (position != 0) & (remainder > position)
+    # byOffset[q, p]: moves made from offset q that cross zero if the dial is actually at p.
+    byOffset = pairs[0] @ crossesRight.T.astype(np.int64) + pairs[1] @ crossesLeft.T.astype(np.int64)
+    extra = byOffset[starts[None, :], (starts[:, None] + starts[None, :]) % size].sum(axis=1)
+
+    turns = int((np.abs(moves) // size).sum())
+    ends = (starts + int(offsets[-1])) % size
+    return DialSummary(ends, landings, turns + extra + landings)
+
+
+def simulateMoves(moves: np.ndarray, size: int = DIAL_SIZE) -> DialSummary:
+    """
+    Builds the DialSummary of a short block by running it from every start at once.
+
+    This is a (size, len(moves)) array evaluation, which is far cheaper than the histogram
+    products in summarizeMoves when the block is only a few dozen moves long.
+    """
+    if moves.size == 0:
+        return DialSummary.identity(size)
+    positions, landings, crossings = _dialKernel(moves[None, :], np.arange(size), size)
+    return DialSummary(positions, landings.astype(np.int64), crossings.astype(np.int64))
+
+
+def _summarizeBytes(data: bytes, size: int) -> DialSummary:
+    """Worker entry point: parse a newline-aligned block of the file and summarize it."""
+    return summarizeMoves(parseInstructions(data), size)
+
+
+def _readBlocks(source: str | BinaryIO, blockSize: int) -> Iterator[bytes]:
+    """Yields blocks of roughly blockSize bytes from a filename or binary stream, each extended to the next newline."""
+    if isinstance(source, str):
+        with open(source, "rb") as file:
+            yield from _readBlocks(file, blockSize)
+        return
+    while block := source.read(blockSize):
+        yield block + source.readline()
+
+
+def turnDialMapReduce(
+    filename: str = "input.txt",
+    workers: int | None = None,
+    blockSize: int = 16 << 20,
+    start: int = DIAL_START,
+    size: int = DIAL_SIZE,
+) -> tuple[int, int]:
+    """
+    Computes both passwords by summarizing blocks of the file in a process pool and folding
+    the summaries in order.
+
+    At most two blocks per worker are in flight, so memory stays bounded by the block size.
+    """
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers) as executor:
+        inFlight = workers * 2
+        pending = deque()
+        summary = DialSummary.identity(size)
+        for block in _readBlocks(filename, blockSize):
+            pending.append(executor.submit(_summarizeBytes, block, size))
+            if len(pending) >= inFlight:
+                summary = summary.then(pending.popleft().result())
+        summary = reduce(DialSummary.then, (future.result() for future in pending), summary)
+    return summary.passwords(start)
+
+
+def readMoveBlocks(source: str | BinaryIO = "input.txt", blockSize: int = 1 << 20) -> Iterator[np.ndarray]:
+    """Streams signed move arrays parsed from buffered blocks of a file or binary stream."""
+    for block in _readBlocks(source, blockSize):
+        yield parseInstructions(block)
+
+
+def turnDialStream(
+    source: str | BinaryIO = "input.txt",
+    blockSize: int = 1 << 20,
+    start: int = DIAL_START,
+    size: int = DIAL_SIZE,
+) -> Iterator[tuple[int, int, int]]:
+    """
+    Yields (instructions read, part1, part2) after each block, so passwords for the prefix read
+    so far are available while the rest of the input is still streaming in. Memory is bounded by
+    blockSize rather than the size of the input.
+    """
+    dialPos, count, part1, part2 = start, 0, 0, 0
+    for moves in readMoveBlocks(source, blockSize):
+        dialPos, landings, crossings = _evaluateMoves(moves, dialPos, size)
+        count += moves.size
+        part1 += landings
+        part2 += crossings
+        yield count, part1, part2
+
+
+def parseMove(instruction: str) -> int:
+    """Parses one instruction such as 'L68' into a signed move."""
+    direction = instruction[0]
+    amount = int(instruction[1:])
+    if direction == 'L':
+        return -amount
+    if direction == 'R':
+        return amount
+    raise ValueError(f"Unknown direction in instruction {instruction!r}")
+
+
+class DialLog:
+    """
+    Dial log that keeps its passwords up to date as instructions are appended or corrected.
+
+    Instructions are grouped into leaves of leafSize moves, and a segment tree stores the
+    DialSummary of every node. Appending or editing refreshes one leaf and its path to the root,
+    and password queries walk O(log n) nodes from the starting position.
+    """
+
+    def __init__(self, instructions: Iterable[str] = (), leafSize: int = 64, size: int = DIAL_SIZE):
+        self.leafSize = leafSize
+        self.size = size
+        self.moves: list[int] = []
+        self._capacity = 1
+        self._tree = [DialSummary.identity(size)] * 2
+        self.extend(instructions)
+
+    def __len__(self) -> int:
+        return len(self.moves)
+
+    def append(self, instruction: str) -> None:
+        """Adds one instruction to the end of the log."""
+        self.moves.append(parseMove(instruction))
+        self._refresh(len(self.moves) - 1, len(self.moves))
+
+    def extend(self, instructions: Iterable[str]) -> None:
+        """Adds many instructions, refreshing each touched leaf once."""
+        first = len(self.moves)
+        self.moves.extend(parseMove(instruction) for instruction in instructions)
+        self._refresh(first, len(self.moves))
+
+    def __setitem__(self, index: int, instruction: str) -> None:
+        """Corrects the instruction at index."""
+        index = range(len(self.moves))[index]
+        self.moves[index] = parseMove(instruction)
+        self._refresh(index, index + 1)
+
+    def passwords(self, upTo: int | None = None, start: int = DIAL_START) -> tuple[int, int]:
+        """Part 1 and part 2 passwords after the first upTo instructions (all of them by default)."""
+        upTo = len(self.moves) if upTo is None else min(upTo, len(self.moves))
+        fullLeaves, remainder = divmod(upTo, self.leafSize)
+        state = [start, 0, 0]
+        self._walk(1, 0, self._capacity, fullLeaves, state)
+        dialPos, part1, part2 = state
+        tail = np.array(self.moves[upTo - remainder : upTo], dtype=np.int64)
+        dialPos, landings, crossings = _evaluateMoves(tail, dialPos, self.size)
+        return part1 + landings, part2 + crossings
+
+    def _walk(self, node: int, low: int, high: int, leaves: int, state: list[int]) -> None:
+        """Applies, in order, the nodes covering leaves [0, leaves) to state = [dialPos, part1, part2]."""
+        if leaves <= low:
+            return
+        if high <= leaves:
+            summary = self._tree[node]
+            dialPos = state[0]
+            state[0] = int(summary.ends[dialPos])
+            state[1] += int(summary.landings[dialPos])
+            state[2] += int(summary.crossings[dialPos])
+            return
+        middle = (low + high) // 2
+        self._walk(2 * node, low, middle, leaves, state)
+        self._walk(2 * node + 1, middle, high, leaves, state)
+
+    def _refresh(self, first: int, end: int) -> None:
+        """Recomputes the leaves holding moves [first, end) and their ancestors."""
+        if first >= end:
+            return
+        leaves = -(-len(self.moves) // self.leafSize)
+        if leaves > self._capacity:
+            self._grow(leaves)
+            return
+        for leaf in range(first // self.leafSize, (end - 1) // self.leafSize + 1):
+            node = self._capacity + leaf
+            self._tree[node] = self._summarizeLeaf(leaf)
+            node //= 2
+            while node:
+                self._tree[node] = self._tree[2 * node].then(self._tree[2 * node + 1])
+                node //= 2
+
+    def _grow(self, leaves: int) -> None:
+        """Doubles the capacity until it holds leaves leaves and rebuilds the whole tree."""
+        while self._capacity < leaves:
+            self._capacity *= 2
+        identity = DialSummary.identity(self.size)
+        self._tree = [identity] * (2 * self._capacity)
+        for leaf in range(leaves):
+            self._tree[self._capacity + leaf] = self._summarizeLeaf(leaf)
+        for node in range(self._capacity - 1, 0, -1):
+            self._tree[node] = self._tree[2 * node].then(self._tree[2 * node + 1])
+
+    def _summarizeLeaf(self, leaf: int) -> DialSummary:
+        moves = self.moves[leaf * self.leafSize : (leaf + 1) * self.leafSize]
+        return simulateMoves(np.array(moves, dtype=np.int64), self.size)
+
+
 if __name__ == "__main__":
     main()
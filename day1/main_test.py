@@ -1,6 +1,23 @@
+import io
+import os
+import random
+import tempfile
 import unittest
 
-from main import turnDial, turnDial2
+from main import (
+    DialLog,
+    parseLines,
+    simulateMoves,
+    summarizeMoves,
+    turnDial,
+    turnDial2,
+    turnDialBatch,
+    turnDialMapReduce,
+    turnDialStream,
+    turnDials,
+    turnDialVectorized,
+    turnDial2Vectorized,
+)
 
 class TestTurnDial(unittest.TestCase):
 
@@ -35,6 +52,101 @@ class TestTurnDial(unittest.TestCase):
         # assert turnDial2(instructions) == 6
         assert turnDial2(['R1000']) == 10
 
+class TestTurnDials(unittest.TestCase):
+
+    def test_matches_turnDial(self):
+        rng = random.Random(2)
+        instructions = [rng.choice('LR') + str(rng.choice([0, 100, rng.randint(0, 999)])) for _ in range(500)]
+        assert turnDials(instructions) == (turnDial(instructions), turnDial2(instructions))
+
+    def test_sampled_trace(self):
+        steps = []
+        result = turnDials(['L68', 'L30', 'R48', 'L5', 'R60'], trace=lambda step, *_: steps.append(step), traceEvery=2)
+        assert steps == [1, 3]
+        assert result == turnDials(['L68', 'L30', 'R48', 'L5', 'R60'])
+
+class TestTurnDialVectorized(unittest.TestCase):
+
+    def test_parseLines(self):
+        assert parseLines(['L68', 'R48', 'L5', 'R1000']).tolist() == [-68, 48, -5, 1000]
+
+    def test_matches_turnDial(self):
+        rng = random.Random(1)
+        instructions = [rng.choice('LR') + str(rng.choice([0, 100, 200, rng.randint(0, 999)])) for _ in range(500)]
+        moves = parseLines(instructions)
+        assert turnDialVectorized(moves, chunkSize=37) == turnDial(instructions)
+        assert turnDial2Vectorized(moves, chunkSize=37) == turnDial2(instructions)
+        assert turnDial2Vectorized(parseLines(['R1000'])) == 10
+
+class TestDialSummary(unittest.TestCase):
+
+    def test_summaries_compose(self):
+        rng = random.Random(3)
+        instructions = [rng.choice('LR') + str(rng.choice([0, 100, rng.randint(0, 999)])) for _ in range(300)]
+        moves = parseLines(instructions)
+        whole = summarizeMoves(moves)
+        split = summarizeMoves(moves[:120]).then(summarizeMoves(moves[120:]))
+        assert whole.passwords() == split.passwords() == turnDials(instructions)
+        assert (whole.crossings == split.crossings).all()
+
+    def test_simulateMoves_matches_summarizeMoves(self):
+        rng = random.Random(9)
+        instructions = [rng.choice('LR') + str(rng.choice([0, 100, rng.randint(0, 999)])) for _ in range(64)]
+        moves = parseLines(instructions)
+        simulated = simulateMoves(moves)
+        summarized = summarizeMoves(moves)
+        assert (simulated.ends == summarized.ends).all()
+        assert (simulated.landings == summarized.landings).all()
+        assert (simulated.crossings == summarized.crossings).all()
+
+    def test_turnDialMapReduce(self):
+        rng = random.Random(4)
+        instructions = [rng.choice('LR') + str(rng.randint(0, 999)) for _ in range(2000)]
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'input.txt')
+            with open(filename, 'w') as file:
+                file.write('\n'.join(instructions) + '\n')
+            assert turnDialMapReduce(filename, workers=2, blockSize=1000) == turnDials(instructions)
+
+class TestDialLog(unittest.TestCase):
+
+    def test_append_edit_and_prefix(self):
+        rng = random.Random(6)
+        instructions = [rng.choice('LR') + str(rng.choice([0, 100, rng.randint(0, 999)])) for _ in range(300)]
+        log = DialLog(instructions[:50], leafSize=8)
+        for instruction in instructions[50:]:
+            log.append(instruction)
+        assert log.passwords() == turnDials(instructions)
+        assert log.passwords(upTo=123) == turnDials(instructions[:123])
+        instructions[77] = 'L250'
+        log[77] = 'L250'
+        assert log.passwords() == turnDials(instructions)
+
+class TestTurnDialStream(unittest.TestCase):
+
+    def test_running_passwords(self):
+        rng = random.Random(7)
+        instructions = [rng.choice('LR') + str(rng.randint(0, 999)) for _ in range(500)]
+        stream = io.BytesIO(('\n'.join(instructions) + '\n').encode())
+        results = list(turnDialStream(stream, blockSize=256))
+        assert len(results) > 1
+        for count, part1, part2 in results:
+            assert (part1, part2) == turnDials(instructions[:count])
+        assert results[-1][0] == len(instructions)
+
+class TestTurnDialBatch(unittest.TestCase):
+
+    def test_matches_single_dials(self):
+        rng = random.Random(8)
+        sequences = [parseLines([rng.choice('LR') + str(rng.randint(0, 300)) for _ in range(rng.randint(0, 40))]) for _ in range(20)]
+        sequences.append(parseLines([rng.choice('LR') + str(rng.randint(0, 300)) for _ in range(200)]))
+        sizes = [rng.randint(2, 120) for _ in sequences]
+        starts = [rng.randrange(size) for size in sizes]
+        part1, part2 = turnDialBatch(sequences, sizes, starts, chunkSize=16)
+        for row, moves in enumerate(sequences):
+            assert part1[row] == turnDialVectorized(moves, starts[row], sizes[row])
+            assert part2[row] == turnDial2Vectorized(moves, starts[row], sizes[row])
+
 # Run tests
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
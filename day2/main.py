@@ -1,3 +1,10 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
 def read_number_pairs(filename='day2/input.txt'):
     """
     Reads from a file and splits the line of text by comma,
@@ -34,21 +41,63 @@ def find_repeated_numbers(pairs):
     palindromic_numbers = []
     
     for start, end in pairs:
-        for num in range(start, end + 1):
-            num_str = str(num)
-            length = len(num_str)
-            
-            # Only check even-length numbers (odd-length can't have equal halves)
-            if length % 2 == 0:
-                mid = length // 2
-                first_half = num_str[:mid]
-                second_half = num_str[mid:]
-                
-                if first_half == second_half:
-                    palindromic_numbers.append(num)
+        palindromic_numbers.extend(generate_repeated_numbers(start, end))
     
     return palindromic_numbers
 
+
+def _repeated_half_ranges(start, end):
+    """
+    Yields (multiplier, low, high) for each even digit length that can fall in [start, end].
+    
+    A 2h-digit number with equal halves is half * (10^h + 1), so the matches of that
+    length are exactly multiplier * half for half in [low, high].
+    """
+    half_length = 1
+    while 10 ** (half_length - 1) * (10 ** half_length + 1) <= end:
+        multiplier = 10 ** half_length + 1
+        low = max(10 ** (half_length - 1), -(-start // multiplier))
+        high = min(10 ** half_length - 1, end // multiplier)
+        if low <= high:
+            yield multiplier, low, high
+        half_length += 1
+
+
+def generate_repeated_numbers(start, end):
+    """
+    Yields, in increasing order, the numbers in [start, end] whose first half
+    equals their second half, built from their halves instead of testing every number.
+    
+    Args:
+        start: First number of the range
+        end: Last number of the range (inclusive)
+        
+    Returns:
+        Generator of matching numbers
+    """
+    for multiplier, low, high in _repeated_half_ranges(start, end):
+        yield from range(low * multiplier, high * multiplier + 1, multiplier)
+
+
+def repeated_number_stats(pairs):
+    """
+    Counts and sums the numbers found by find_repeated_numbers without listing them.
+    
+    Args:
+        pairs: List of tuples containing (start, end) ranges
+        
+    Returns:
+        Tuple of (count, sum)
+    """
+    count = 0
+    total = 0
+    for start, end in pairs:
+        for multiplier, low, high in _repeated_half_ranges(start, end):
+            halves = high - low + 1
+            count += halves
+            total += multiplier * (low + high) * halves // 2
+    return count, total
+
 def find_repeated_pattern_numbers(pairs):
     """
     Takes a list of pairs and returns a list of numbers where the number
@@ -66,23 +115,314 @@ def find_repeated_pattern_numbers(pairs):
     
     for start, end in pairs:
         for num in range(start, end + 1):
-            num_str = str(num)
-            length = len(num_str)
-            
-            # Try all possible pattern lengths (from 1 to half the number length)
-            for pattern_len in range(1, (length // 2) + 1):
-                if length % pattern_len == 0:
-                    # Extract the pattern
-                    pattern = num_str[:pattern_len]
-                    # Check if repeating this pattern gives us the original number
-                    repetitions = length // pattern_len
-                    if pattern * repetitions == num_str:
-                        repeated_numbers.append(num)
-                        break  # Found a valid pattern, no need to check longer ones
+            if is_repeated_pattern_number(num):
+                repeated_numbers.append(num)
     
     return repeated_numbers
 
 
+def is_repeated_number(num):
+    """Checks whether the first half of num equals its second half."""
+    num_str = str(num)
+    length = len(num_str)
+    # Only even-length numbers can have equal halves
+    mid = length // 2
+    return length % 2 == 0 and num_str[:mid] == num_str[mid:]
+
+
+def is_repeated_pattern_number(num):
+    """Checks whether num is made up of a repeated pattern of digits."""
+    num_str = str(num)
+    length = len(num_str)
+    
+    # Try all possible pattern lengths (from 1 to half the number length)
+    for pattern_len in range(1, (length // 2) + 1):
+        if length % pattern_len == 0:
+            # Check if repeating the pattern gives us the original number
+            repetitions = length // pattern_len
+            if num_str[:pattern_len] * repetitions == num_str:
+                return True
+    return False
+
+
+def _divisors(n):
+    """Returns the divisors of n in increasing order."""
+    return [d for d in range(1, n + 1) if n % d == 0]
+
+
+def _mobius(n):
+    """Möbius function: 0 if n has a squared prime factor, else (-1)^(number of prime factors)."""
+    result = 1
+    factor = 2
+    while factor * factor <= n:
+        if n % factor == 0:
+            n //= factor
+            if n % factor == 0:
+                return 0
+            result = -result
+        factor += 1
+    return -result if n > 1 else result
+
+
+def _periodic_stats(length, period, start, end):
+    """
+    Count and sum of the length-digit numbers in [start, end] that are a block of
+    period digits repeated length // period times.
+    
+    Such a number is block * (10^length - 1) / (10^period - 1) with a block that has
+    no leading zero, so the matches form an arithmetic series of blocks.
+    """
+    multiplier = (10 ** length - 1) // (10 ** period - 1)
+    low = max(10 ** (period - 1), -(-start // multiplier))
+    high = min(10 ** period - 1, end // multiplier)
+    if low > high:
+        return 0, 0
+    blocks = high - low + 1
+    return blocks, multiplier * (low + high) * blocks // 2
+
+
+def _primitive_period_stats(length, period, start, end):
+    """
+    Count and sum of the length-digit numbers in [start, end] whose shortest repeating
+    block has exactly period digits.
+    
+    A number repeats with period e exactly when its shortest period divides e, so
+    Möbius inversion over the divisors of period removes the shorter periods.
+    """
+    count = 0
+    total = 0
+    for divisor in _divisors(period):
+        sign = _mobius(period // divisor)
+        if sign:
+            divisor_count, divisor_total = _periodic_stats(length, divisor, start, end)
+            count += sign * divisor_count
+            total += sign * divisor_total
+    return count, total
+
+
+def repeated_pattern_stats(pairs):
+    """
+    Counts and sums the numbers found by find_repeated_pattern_numbers without
+    iterating over the ranges.
+    
+    Every repeated-pattern number has a unique shortest block, so the totals are the
+    sum over digit lengths and their proper divisors of the primitive-period counts.
+    
+    Args:
+        pairs: List of tuples containing (start, end) ranges
+        
+    Returns:
+        Tuple of (count, sum)
+    """
+    count = 0
+    total = 0
+    for start, end in pairs:
+        for length in range(max(len(str(start)), 2), len(str(end)) + 1):
+            for period in _divisors(length)[:-1]:
+                period_count, period_total = _primitive_period_stats(length, period, start, end)
+                count += period_count
+                total += period_total
+    return count, total
+
+
+def repetition_histogram(start, end):
+    """
+    Breaks down the repeated-pattern numbers in [start, end] by how many times their
+    shortest block is repeated.
+    
+    Example: 1212 is "12" repeated 2 times, 111 is "1" repeated 3 times.
+    
+    All k are computed together from the divisor lattice of each digit length. Adding
+    up every k gives repeated_pattern_stats, and adding up the even k gives
+    repeated_number_stats.
+    
+    Args:
+        start: First number of the range
+        end: Last number of the range (inclusive)
+        
+    Returns:
+        Dict mapping each repetition count k to a (count, sum) tuple, in increasing k
+    """
+    histogram = {}
+    for length in range(max(len(str(start)), 2), len(str(end)) + 1):
+        for period in _divisors(length)[:-1]:
+            count, total = _primitive_period_stats(length, period, start, end)
+            if count:
+                repetitions = length // period
+                previous_count, previous_total = histogram.get(repetitions, (0, 0))
+                histogram[repetitions] = (previous_count + count, previous_total + total)
+    return dict(sorted(histogram.items()))
+
+
+def merge_ranges(pairs):
+    """
+    Sorts the ranges and merges any that overlap or touch, so that no number is
+    covered twice.
+    
+    Example: [(5, 10), (1, 3), (4, 6), (20, 25)] returns [(1, 10), (20, 25)]
+    """
+    merged = []
+    for start, end in sorted(pairs):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def split_ranges(pairs, chunk_size):
+    """Yields pieces of the ranges, in order, each holding at most chunk_size numbers."""
+    for start, end in pairs:
+        for chunk_start in range(start, end + 1, chunk_size):
+            yield chunk_start, min(chunk_start + chunk_size - 1, end)
+
+
+def _scan_chunk(start, end, predicate):
+    """Worker entry point: the numbers in [start, end] accepted by predicate."""
+    return [num for num in range(start, end + 1) if predicate(num)]
+
+
+def _scan_chunk_stats(start, end, predicate):
+    """Worker entry point: count and sum of the numbers in [start, end] accepted by predicate."""
+    count = 0
+    total = 0
+    for num in range(start, end + 1):
+        if predicate(num):
+            count += 1
+            total += num
+    return count, total
+
+
+def _scan_parallel(worker, pairs, predicate, workers, chunk_size):
+    """
+    Merges the ranges, splits the union into balanced chunks and yields worker results
+    in chunk order, with at most two chunks per process in flight.
+    """
+    merged = merge_ranges(pairs)
+    workers = workers or os.cpu_count() or 1
+    if chunk_size is None:
+        size = sum(end - start + 1 for start, end in merged)
+        chunk_size = min(max(-(-size // (workers * 8)), 1), 1 << 20)
+    with ProcessPoolExecutor(workers) as executor:
+        pending = deque()
+        for start, end in split_ranges(merged, chunk_size):
+            pending.append(executor.submit(worker, start, end, predicate))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def scan_numbers(pairs, predicate=is_repeated_pattern_number, workers=None, chunk_size=None):
+    """
+    Lazily yields, in increasing order and without duplicates, the numbers covered by
+    the ranges that satisfy predicate, scanning chunks of the merged ranges in a
+    process pool.
+    
+    Args:
+        pairs: List of tuples containing (start, end) ranges, possibly overlapping
+        predicate: Module-level function taking a number, e.g. is_repeated_number
+        workers: Number of worker processes (defaults to the CPU count)
+        chunk_size: Numbers per chunk (defaults to an even split across the workers)
+        
+    Returns:
+        Generator of matching numbers
+    """
+    for matches in _scan_parallel(_scan_chunk, pairs, predicate, workers, chunk_size):
+        yield from matches
+
+
+def scan_stats(pairs, predicate=is_repeated_pattern_number, workers=None, chunk_size=None):
+    """
+    Count and sum of the numbers yielded by scan_numbers, without building any list.
+    
+    Returns:
+        Tuple of (count, sum)
+    """
+    count = 0
+    total = 0
+    for chunk_count, chunk_total in _scan_parallel(_scan_chunk_stats, pairs, predicate, workers, chunk_size):
+        count += chunk_count
+        total += chunk_total
+    return count, total
+
+
+class RepeatedPatternIndex:
+    """
+    Sorted array of every repeated-pattern number below a bound, with prefix sums,
+    so that each range query is two binary searches.
+    
+    The index is stored as a single (2, n + 1) uint64 .npy file: the first row holds the
+    numbers followed by the bound, the second the prefix sums. Loading memory-maps it.
+    """
+    
+    def __init__(self, data):
+        self.data = data
+        self.values = data[0, :-1]
+        self.prefix_sums = data[1]
+        self.bound = int(data[0, -1])
+    
+    @classmethod
+    def build(cls, bound=10 ** 12):
+        """Builds the index of all repeated-pattern numbers below bound."""
+        _, total = repeated_pattern_stats([(1, bound - 1)])
+        if bound >= 2 ** 64 or total >= 2 ** 64:
+            raise ValueError(f"Bound {bound} is too large for a uint64 index")
+        
+        parts = [np.zeros(0, dtype=np.uint64)]
+        for length in range(2, len(str(bound - 1)) + 1):
+            for period in _divisors(length)[:-1]:
+                multiplier = (10 ** length - 1) // (10 ** period - 1)
+                blocks = np.arange(10 ** (period - 1), 10 ** period, dtype=np.uint64)
+                parts.append(blocks * np.uint64(multiplier))
+        values = np.unique(np.concatenate(parts))
+        values = values[values < np.uint64(bound)]
+        
+        data = np.zeros((2, values.size + 1), dtype=np.uint64)
+        data[0, :-1] = values
+        data[0, -1] = bound
+        np.cumsum(values, out=data[1, 1:])
+        return cls(data)
+    
+    def save(self, path):
+        """Writes the index to path as a .npy file."""
+        np.save(path, self.data)
+    
+    @classmethod
+    def load(cls, path):
+        """Memory-maps an index written by save()."""
+        return cls(np.load(path, mmap_mode='r'))
+    
+    def query(self, start, end):
+        """
+        Count and sum of the repeated-pattern numbers in [start, end].
+        
+        Args:
+            start: First number of the range
+            end: Last number of the range (inclusive), below the index bound
+            
+        Returns:
+            Tuple of (count, sum)
+        """
+        if end >= self.bound:
+            raise ValueError(f"Range end {end} is not below the index bound {self.bound}")
+        if start > end:
+            return 0, 0
+        first = int(np.searchsorted(self.values, np.uint64(max(start, 0)), side='left'))
+        last = int(np.searchsorted(self.values, np.uint64(end), side='right'))
+        return last - first, int(self.prefix_sums[last]) - int(self.prefix_sums[first])
+    
+    def query_pairs(self, pairs):
+        """Count and sum over a list of (start, end) ranges, like repeated_pattern_stats."""
+        count = 0
+        total = 0
+        for start, end in pairs:
+            pair_count, pair_total = self.query(start, end)
+            count += pair_count
+            total += pair_total
+        return count, total
+
+
 def main():
     print("Hello from day2!")
     pairs = read_number_pairs()
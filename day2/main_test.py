@@ -0,0 +1,74 @@
+import os
+import random
+import tempfile
+import unittest
+
+from main import (
+    RepeatedPatternIndex,
+    find_repeated_pattern_numbers,
+    is_repeated_number,
+    repeated_number_stats,
+    repeated_pattern_stats,
+    repetition_histogram,
+    scan_numbers,
+    scan_stats,
+)
+
+
+def random_pairs(rng, count):
+    pairs = []
+    for _ in range(count):
+        start = rng.randint(1, 10 ** rng.randint(1, 6))
+        pairs.append((start, start + rng.randint(0, 5000)))
+    return pairs
+
+
+class Tests(unittest.TestCase):
+    def test_repeated_number_stats(self):
+        rng = random.Random(1)
+        for _ in range(50):
+            pairs = random_pairs(rng, 3)
+            numbers = [num for start, end in pairs for num in range(start, end + 1) if is_repeated_number(num)]
+            assert repeated_number_stats(pairs) == (len(numbers), sum(numbers))
+
+    def test_repeated_pattern_stats(self):
+        rng = random.Random(2)
+        for _ in range(50):
+            pairs = random_pairs(rng, 3)
+            numbers = find_repeated_pattern_numbers(pairs)
+            assert repeated_pattern_stats(pairs) == (len(numbers), sum(numbers))
+        assert repeated_pattern_stats([(11, 22), (95, 115)]) == (4, 243)
+
+    def test_repetition_histogram(self):
+        rng = random.Random(3)
+        for start, end in random_pairs(rng, 30):
+            expected = {}
+            for num in find_repeated_pattern_numbers([(start, end)]):
+                num_str = str(num)
+                period = next(p for p in range(1, len(num_str)) if num_str[:p] * (len(num_str) // p) == num_str)
+                count, total = expected.get(len(num_str) // period, (0, 0))
+                expected[len(num_str) // period] = (count + 1, total + num)
+            assert repetition_histogram(start, end) == dict(sorted(expected.items()))
+
+    def test_repeated_pattern_index(self):
+        rng = random.Random(4)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "index.npy")
+            RepeatedPatternIndex.build(10 ** 7).save(path)
+            index = RepeatedPatternIndex.load(path)
+            for start, end in random_pairs(rng, 30):
+                assert index.query(start, end) == repeated_pattern_stats([(start, end)])
+            with self.assertRaises(ValueError):
+                index.query(1, 10 ** 7)
+
+    def test_scan_numbers(self):
+        rng = random.Random(5)
+        pairs = random_pairs(rng, 6) + [(100, 2000), (1500, 3000)]
+        covered = sorted({num for start, end in pairs for num in range(start, end + 1)})
+        expected = find_repeated_pattern_numbers([(num, num) for num in covered])
+        assert list(scan_numbers(pairs, workers=2, chunk_size=500)) == expected
+        assert scan_stats(pairs, workers=2) == (len(expected), sum(expected))
+
+
+if __name__ == "__main__":
+    unittest.main()
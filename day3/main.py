@@ -1,4 +1,9 @@
-from itertools import combinations
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
 
 def read_input(filename="input.txt"):
     """Read input file and return a list of all lines."""
@@ -20,32 +25,244 @@ def find_largest_two_digit(s):
         811111111111119 returns 89
         818181911112111 returns 92
     """
-    max_value = -1
+    return int(max_subsequence(s, 2))
+
+
+def find_max_joltage(s, length) -> str:
+    """Find the largest length-digit string that appears with digits in order."""
+    return max_subsequence(s, length)
+
+
+def max_subsequence(s, k) -> str:
+    """
+    Return the largest k-character subsequence of s in a single left-to-right pass.
     
-    pairs = [int("".join(combo)) for combo in combinations(s, 2)]
+    A stack holds the answer so far; a smaller digit is popped whenever a larger one
+    arrives and enough characters remain to still fill k positions.
     
-    return max(pairs)
+    Examples:
+        max_subsequence("818181911112111", 2) returns "92"
+        max_subsequence("987654321111111", 12) returns "987654321111"
+    """
+    return "".join(_max_subsequence_stack(s, k))
 
-def find_max_joltage(s, length) -> str:
-    if length == 0:
-        return ""
-    next_digit = max(s[: len(s) - length + 1])
-    next_pos = s.find(next_digit)
-    return next_digit + find_max_joltage(s[next_pos + 1 :], length - 1)
+
+def _max_subsequence_stack(digits, k):
+    """Monotonic-stack selection behind max_subsequence, for any sequence of comparable digits."""
+    if not 0 <= k <= len(digits):
+        raise ValueError(f"Cannot pick {k} digits from a string of length {len(digits)}")
+    drops = len(digits) - k
+    stack = []
+    for digit in digits:
+        while drops and stack and stack[-1] < digit:
+            stack.pop()
+            drops -= 1
+        stack.append(digit)
+    return stack[:k]
+
+
+class JoltageIndex:
+    """
+    Range-maximum index over one bank, built once and shared by queries for any k.
+    
+    table[j][i] is the position of the first largest digit in s[i : i + 2**j], so the
+    first maximum of any window comes from two overlapping entries. Building takes
+    O(n log n) and each k-digit answer takes O(k).
+    """
+    
+    def __init__(self, s):
+        self.s = s
+        self.table = [list(range(len(s)))]
+        level = 1
+        while (1 << level) <= len(s):
+            previous = self.table[-1]
+            half = 1 << (level - 1)
+            self.table.append([a if s[a] >= s[b] else b for a, b in zip(previous, previous[half:])])
+            level += 1
+    
+    def first_max(self, low, high):
+        """Position of the first largest digit in s[low : high + 1]."""
+        level = (high - low + 1).bit_length() - 1
+        a = self.table[level][low]
+        b = self.table[level][high - (1 << level) + 1]
+        return a if self.s[a] >= self.s[b] else b
+    
+    def max_joltage(self, length) -> str:
+        """Same result as find_max_joltage(s, length), answered from the index."""
+        if not 0 <= length <= len(self.s):
+            raise ValueError(f"Cannot pick {length} digits from a string of length {len(self.s)}")
+        digits = []
+        position = 0
+        for step in range(length):
+            position = self.first_max(position, len(self.s) - length + step)
+            digits.append(self.s[position])
+            position += 1
+        return "".join(digits)
+
+
+def read_digit_matrix(filename="input.txt"):
+    """
+    Read a file of equal-length digit lines into a 2D uint8 array, one row per line.
+    
+    The rows are taken straight from the file bytes using the position of the first
+    newline as the row stride, so no per-line Python objects are created.
+    """
+    with open(filename, 'rb') as f:
+        data = f.read()
+    if not data.strip():
+        return np.zeros((0, 0), dtype=np.uint8)
+    if b"\n" not in data:
+        data += b"\n"
+    stride = data.index(b"\n") + 1
+    crlf = data[stride - 2 : stride] == b"\r\n"
+    if not data.endswith(b"\n"):
+        data += b"\r\n" if crlf else b"\n"
+    if len(data) % stride:
+        raise ValueError("Lines must all have the same length")
+    rows = np.frombuffer(data, dtype=np.uint8).reshape(-1, stride)
+    width = stride - 2 if crlf else stride - 1
+    digits = rows[:, :width] - ord("0")
+    if (rows[:, -1] != ord("\n")).any() or (digits > 9).any():
+        raise ValueError("Lines must all have the same length and contain only digits")
+    return digits
+
+
+def max_joltage_batch(digits, k, block_rows=1 << 16):
+    """
+    Largest k-digit value of every row of a digit matrix, computed for all rows at once.
+    
+    Each of the k steps takes, in every row, the first maximum of the window that still
+    leaves enough digits for the remaining steps, exactly like find_max_joltage.
+    
+    Args:
+        digits: 2D uint8 array from read_digit_matrix
+        k: Number of digits to pick (at most 18 so values fit in int64)
+        block_rows: Rows processed together, bounding temporary memory
+        
+    Returns:
+        int64 array with one value per row
+    """
+    rows, width = digits.shape
+    if not 0 <= k <= min(width, 18):
+        raise ValueError(f"Cannot pick {k} digits from rows of width {width}")
+    positions = np.arange(width)
+    values = np.zeros(rows, dtype=np.int64)
+    for offset in range(0, rows, block_rows):
+        block = digits[offset : offset + block_rows].astype(np.int8)
+        index = np.arange(block.shape[0])
+        start = np.zeros(block.shape[0], dtype=np.int64)
+        result = np.zeros(block.shape[0], dtype=np.int64)
+        for step in range(k):
+            window = (positions >= start[:, None]) & (positions <= width - k + step)
+            pick = np.where(window, block, -1).argmax(axis=1)
+            result = result * 10 + block[index, pick]
+            start = pick + 1
+        values[offset : offset + block_rows] = result
+    return values
+
+
+def _chunk_bounds(filename, chunks):
+    """Split a file into up to chunks byte ranges that each end on a line boundary."""
+    size = os.path.getsize(filename)
+    if size == 0:
+        return []
+    with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        bounds = []
+        start = 0
+        for chunk in range(1, chunks + 1):
+            end = mapped.find(b"\n", max(size * chunk // chunks - 1, start)) + 1 or size
+            if end > start:
+                bounds.append((start, end))
+                start = end
+            if start >= size:
+                break
+        return bounds
+
+
+def _sum_chunk(filename, start, end, lengths):
+    """
+    Worker entry point: sum the largest values of each length over the lines in
+    bytes [start, end) of the file, reading them through a memoryview of the mapping.
+    """
+    totals = [0] * len(lengths)
+    with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)
+        try:
+            position = start
+            while position < end:
+                line_end = mapped.find(b"\n", position, end)
+                if line_end == -1:
+                    line_end = end
+                line = view[position:line_end]
+                if len(line) and line[-1] == ord("\r"):
+                    line = line[:-1]
+                if len(line):
+                    for i, length in enumerate(lengths):
+                        value = 0
+                        for digit in _max_subsequence_stack(line, length):
+                            value = value * 10 + digit - ord("0")
+                        totals[i] += value
+                line.release()
+                position = line_end + 1
+        finally:
+            view.release()
+    return totals
+
+
+def sum_max_joltage_parallel(filename="input.txt", lengths=(2, 12), workers=None):
+    """
+    Sum the largest values of each requested length over all lines, splitting the
+    memory-mapped file into newline-aligned chunks that worker processes read in place.
+    
+    Args:
+        filename: Input file of digit lines
+        lengths: Digit counts to sum, e.g. (2, 12)
+        workers: Number of worker processes (defaults to the CPU count)
+        
+    Returns:
+        List of sums in the order of lengths
+    """
+    workers = workers or os.cpu_count() or 1
+    totals = [0] * len(lengths)
+    with ProcessPoolExecutor(workers) as executor:
+        futures = [
+            executor.submit(_sum_chunk, filename, start, end, tuple(lengths))
+            for start, end in _chunk_bounds(filename, workers * 4)
+        ]
+        for future in futures:
+            for i, total in enumerate(future.result()):
+                totals[i] += total
+    return totals
+
+
+def sum_max_joltage(filename="input.txt", lengths=(2, 12)):
+    """
+    Sum the largest values of each requested length over all lines.
+    
+    Equal-length lines are handled a whole block at a time with max_joltage_batch;
+    files with lines of differing lengths fall back to max_subsequence line by line.
+    
+    Args:
+        filename: Input file of digit lines
+        lengths: Digit counts to sum, e.g. (2, 12)
+        
+    Returns:
+        Tuple of (number of lines, list of sums in the order of lengths)
+    """
+    try:
+        digits = read_digit_matrix(filename)
+    except ValueError:
+        lines = read_input(filename)
+        return len(lines), [sum(int(max_subsequence(line, k)) for line in lines) for k in lengths]
+    return len(digits), [int(max_joltage_batch(digits, k).sum()) for k in lengths]
 
 
 def main():
-    lines = read_input()
+    line_count, (total2, total12) = sum_max_joltage()
     print("Hello from day3!")
-    print(f"Read {len(lines)} lines from input.txt")
-    
-    # Map the find_largest_two_digit function to each line and sum the results
-    values = [find_largest_two_digit(line) for line in lines]
-    total = sum(values)
-    print(f"Sum of largest two-digit values: {total}")
-    values = [int(find_max_joltage(line, 12)) for line in lines]
-    total = sum(values)
-    print(f"Sum of largest twelve-digit values: {total}")
+    print(f"Read {line_count} lines from input.txt")
+    print(f"Sum of largest two-digit values: {total2}")
+    print(f"Sum of largest twelve-digit values: {total12}")
 
 
 if __name__ == "__main__":
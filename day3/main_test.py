@@ -1,7 +1,9 @@
+import os
+import tempfile
 import unittest
 from devtools import debug
 
-from main import find_max_joltage
+from main import JoltageIndex, find_largest_two_digit, find_max_joltage, max_joltage_batch, max_subsequence, read_digit_matrix, sum_max_joltage, sum_max_joltage_parallel
 
 class Tests(unittest.TestCase):
     def test_find_largest_twelve_digits(self):
@@ -9,5 +11,52 @@ class Tests(unittest.TestCase):
         debug(result)
         assert result == "987654321111"
 
+    def test_find_largest_two_digit(self):
+        assert find_largest_two_digit("811111111111119") == 89
+        assert find_largest_two_digit("818181911112111") == 92
+
+    def test_max_subsequence(self):
+        assert max_subsequence("234234234234278", 12) == "434234234278"
+        assert max_subsequence("12", 2) == "12"
+        assert max_subsequence("12", 0) == ""
+
+    def test_joltage_index(self):
+        for line in ["987654321111111", "811111111111119", "234234234234278", "818181911112111"]:
+            index = JoltageIndex(line)
+            for k in range(len(line) + 1):
+                assert index.max_joltage(k) == max_subsequence(line, k)
+
+    def test_max_joltage_batch(self):
+        lines = ["987654321111111", "811111111111119", "234234234234278", "818181911112111"]
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "input.txt")
+            with open(filename, "w") as f:
+                f.write("\n".join(lines) + "\n")
+            digits = read_digit_matrix(filename)
+        for k in (2, 12):
+            assert max_joltage_batch(digits, k, block_rows=3).tolist() == [int(find_max_joltage(line, k)) for line in lines]
+
+    def test_sum_max_joltage_parallel(self):
+        lines = ["987654321111111", "811111111111119", "234234234234278", "818181911112111"] * 5
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "input.txt")
+            with open(filename, "w") as f:
+                f.write("\n".join(lines))
+            totals = sum_max_joltage_parallel(filename, (2, 12), workers=2)
+        assert totals == [sum(int(find_max_joltage(line, k)) for line in lines) for k in (2, 12)]
+
+    def test_sum_max_joltage_ragged(self):
+        lines = ["987654321111111", "811111111111119", "2342342342342785", "8181819111121"]
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "input.txt")
+            with open(filename, "w") as f:
+                f.write("\n".join(lines) + "\n")
+            expected = [sum(int(max_subsequence(line, k)) for line in lines) for k in (2, 12)]
+            assert sum_max_joltage(filename) == (4, expected)
+            with open(filename, "w") as f:
+                f.write("\n".join(lines[:2]) + "\n")
+            assert sum_max_joltage(filename) == (2, [89 + 98, 987654321111 + 811111111119])
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
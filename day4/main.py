@@ -1,4 +1,18 @@
+import os
+import pickle
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
+import numpy as np
+
+NEIGHBOR_THRESHOLD = 4
+
+# 8 ordinal directions: N, NE, E, SE, S, SW, W, NW
+DIRECTIONS = [
+    (-1, 0), (-1, 1), (0, 1), (1, 1),
+    (1, 0), (1, -1), (0, -1), (-1, -1)
+]
 
 
 def read_input():
@@ -24,31 +38,19 @@ def count_at_symbols_with_few_neighbors(matrix):
     cols = len(matrix[0])
     count = 0
     
-    # 8 ordinal directions: N, NE, E, SE, S, SW, W, NW
-    directions = [
-        (-1, 0),   # North
-        (-1, 1),   # North-East
-        (0, 1),    # East
-        (1, 1),    # South-East
-        (1, 0),    # South
-        (1, -1),   # South-West
-        (0, -1),   # West
-        (-1, -1)   # North-West
-    ]
-    
     for i in range(rows):
         for j in range(cols):
             if matrix[i][j] == '@':
                 # Count valid neighbors
                 neighbor_count = 0
-                for di, dj in directions:
+                for di, dj in DIRECTIONS:
                     ni, nj = i + di, j + dj
                     # Check if neighbor position is within bounds
                     if 0 <= ni < rows and 0 <= nj < cols and matrix[ni][nj] == '@':
                         neighbor_count += 1
                 
                 # If less than 4 neighbors, increment count
-                if neighbor_count < 4:
+                if neighbor_count < NEIGHBOR_THRESHOLD:
                     count += 1
     
     return count
@@ -66,50 +68,50 @@ def count_at_symbols_with_few_neighbors_multiple(matrix):
     if not matrix or not matrix[0]:
         return 0
     
-    matrix = [row[:] for row in matrix]
-    count = 0
-    changes_made = True
-    
-    while changes_made:
-        changes_made, iteration_count = _process_matrix_iteration(matrix)
-        count += iteration_count
-    
-    return count
+    return sum(len(removed) for removed in _peel_rounds(matrix))
 
 
-def _process_matrix_iteration(matrix):
-    """Process one iteration of the matrix, marking symbols with few neighbors."""
-    NEIGHBOR_THRESHOLD = 4
-    new_matrix = [row[:] for row in matrix]
-    changes_made = False
-    iteration_count = 0
+def _peel_rounds(matrix):
+    """
+    Yields the positions removed in each round of the multi-round process.
     
+    Neighbor counts are computed once. Removing a round's symbols decrements the counts
+    of their neighbors, and a neighbor joins the next round's worklist at the moment its
+    count drops below the threshold, so each cell is handled a constant number of times.
+    """
     rows = len(matrix)
     cols = len(matrix[0])
+    present = [[cell == '@' for cell in row] for row in matrix]
+    counts = [
+        [_count_neighbors(matrix, i, j, rows, cols) if present[i][j] else 0 for j in range(cols)]
+        for i in range(rows)
+    ]
+    current = [
+        (i, j) for i in range(rows) for j in range(cols)
+        if present[i][j] and counts[i][j] < NEIGHBOR_THRESHOLD
+    ]
     
-    for i in range(rows):
-        for j in range(cols):
-            if matrix[i][j] == '@':
-                neighbor_count = _count_neighbors(matrix, i, j, rows, cols)
-                
-                if neighbor_count < NEIGHBOR_THRESHOLD:
-                    new_matrix[i][j] = 'x'
-                    changes_made = True
-                    iteration_count += 1
-    
-    matrix[:] = new_matrix
-    return changes_made, iteration_count
+    while current:
+        for i, j in current:
+            present[i][j] = False
+        yield current
+        
+        next_round = []
+        for i, j in current:
+            for di, dj in DIRECTIONS:
+                ni, nj = i + di, j + dj
+                if 0 <= ni < rows and 0 <= nj < cols and present[ni][nj]:
+                    counts[ni][nj] -= 1
+                    # Cells still present had at least the threshold until now
+                    if counts[ni][nj] == NEIGHBOR_THRESHOLD - 1:
+                        next_round.append((ni, nj))
+        current = next_round
 
 
 def _count_neighbors(matrix, i, j, rows, cols):
     """Count the number of '@' neighbors for a given position."""
-    directions = [
-        (-1, 0), (-1, 1), (0, 1), (1, 1),
-        (1, 0), (1, -1), (0, -1), (-1, -1)
-    ]
-    
     neighbor_count = 0
-    for di, dj in directions:
+    for di, dj in DIRECTIONS:
         ni, nj = i + di, j + dj
         if _is_valid_neighbor(matrix, ni, nj, rows, cols):
             neighbor_count += 1
@@ -122,6 +124,373 @@ def _is_valid_neighbor(matrix, ni, nj, rows, cols):
     return 0 <= ni < rows and 0 <= nj < cols and matrix[ni][nj] == '@'
 
 
+class PeelDepthMap:
+    """
+    Round in which every '@' is removed by the multi-round process, kept up to date
+    as rolls are added or removed.
+    
+    A roll is removed in the round after the fourth-latest removal among its
+    neighbors (round 1 if it has fewer than 4 neighbors). That rule is local, so
+    removing a roll only re-evaluates cells whose neighbors' rounds actually changed.
+    Adding a roll can only delay removals, and only along chains of rolls whose
+    rounds increase away from it, so just those cells are settled again.
+    """
+    
+    EMPTY = 0
+    NEVER_REMOVED = -1
+    
+    def __init__(self, matrix):
+        self.rows = len(matrix)
+        self.cols = len(matrix[0]) if matrix else 0
+        self.present = [[cell == '@' for cell in row] for row in matrix]
+        # Larger than any possible round, stands for "never removed"
+        self._never = self.rows * self.cols + 1
+        self.depths = [[self._never if cell else self.EMPTY for cell in row] for row in self.present]
+        if self.rows and self.cols:
+            for round_number, removed in enumerate(_peel_rounds(matrix), 1):
+                for i, j in removed:
+                    self.depths[i][j] = round_number
+    
+    def depth(self, i, j):
+        """Removal round of the cell, EMPTY without a roll or NEVER_REMOVED."""
+        depth = self.depths[i][j]
+        return self.NEVER_REMOVED if depth == self._never else depth
+    
+    def depth_map(self):
+        """The removal round of every cell, as a 2D list."""
+        return [[self.depth(i, j) for j in range(self.cols)] for i in range(self.rows)]
+    
+    def removed_count(self):
+        """Same total as count_at_symbols_with_few_neighbors_multiple."""
+        return sum(1 for row in self.depths for depth in row if 0 < depth < self._never)
+    
+    def set_roll(self, i, j, present):
+        """Adds (present=True) or removes a roll at (i, j) and updates the affected rounds."""
+        if self.present[i][j] == present:
+            return
+        self.present[i][j] = present
+        if present:
+            self._raise_affected(i, j)
+            return
+        self.depths[i][j] = self.EMPTY
+        # Rounds can only move earlier, so the worklist settles like peeling does
+        self._settle(list(self._neighbors(i, j)))
+    
+    def _raise_affected(self, i, j):
+        """
+        Recomputes the rounds that adding the roll at (i, j) can delay.
+    
+        A roll's round only moves if a neighbor that was removed earlier than it now
+        goes later, so the affected cells are those reached from (i, j) by stepping to
+        rolls with a strictly later round. They are reset to "never removed" and settled
+        by the same worklist as removals, with every other cell held fixed.
+        """
+        affected = [(i, j)]
+        seen = {(i, j)}
+        for ci, cj in affected:
+            depth = self.depths[ci][cj]
+            for ni, nj in self._neighbors(ci, cj):
+                if (ni, nj) not in seen and depth < self.depths[ni][nj] < self._never:
+                    seen.add((ni, nj))
+                    affected.append((ni, nj))
+        for ci, cj in affected:
+            self.depths[ci][cj] = self._never
+        self._settle(affected, seen)
+    
+    def _settle(self, cells, allowed=None):
+        """Lowers rounds to the local rule's fixpoint, starting from cells and staying within allowed."""
+        queue = deque(cells)
+        queued = set(queue)
+        while queue:
+            ci, cj = queue.popleft()
+            queued.discard((ci, cj))
+            if not self.present[ci][cj]:
+                continue
+            depth = self._local_depth(ci, cj)
+            if depth != self.depths[ci][cj]:
+                self.depths[ci][cj] = depth
+                for neighbor in self._neighbors(ci, cj):
+                    if neighbor not in queued and (allowed is None or neighbor in allowed):
+                        queue.append(neighbor)
+                        queued.add(neighbor)
+    
+    def _neighbors(self, i, j):
+        for di, dj in DIRECTIONS:
+            ni, nj = i + di, j + dj
+            if 0 <= ni < self.rows and 0 <= nj < self.cols:
+                yield ni, nj
+    
+    def _local_depth(self, i, j):
+        """Removal round of a roll given its neighbors' current rounds."""
+        neighbor_depths = sorted((self.depths[ni][nj] for ni, nj in self._neighbors(i, j)), reverse=True)
+        if len(neighbor_depths) < NEIGHBOR_THRESHOLD:
+            return 1
+        return min(neighbor_depths[NEIGHBOR_THRESHOLD - 1] + 1, self._never)
+
+
+def read_grid(filename='input.txt'):
+    """Reads the input straight into a 2D boolean array that is True where there is an '@'."""
+    with open(filename, 'rb') as f:
+        lines = f.read().split()
+    if not lines:
+        return np.zeros((0, 0), dtype=bool)
+    return np.frombuffer(b"".join(lines), dtype=np.uint8).reshape(len(lines), -1) == ord('@')
+
+
+def to_grid(matrix):
+    """Converts a matrix of characters into a 2D boolean array of '@' positions."""
+    if not matrix or not matrix[0]:
+        return np.zeros((0, 0), dtype=bool)
+    return np.array(matrix) == '@'
+
+
+def neighbor_counts(grid):
+    """
+    Counts the '@' neighbors of every cell at once by summing the eight shifted
+    views of the zero-padded grid.
+    """
+    padded = np.pad(grid.astype(np.uint8), 1)
+    rows, cols = grid.shape
+    counts = np.zeros((rows, cols), dtype=np.uint8)
+    for di in (-1, 0, 1):
+        for dj in (-1, 0, 1):
+            if di or dj:
+                counts += padded[1 + di : 1 + di + rows, 1 + dj : 1 + dj + cols]
+    return counts
+
+
+def count_at_symbols_with_few_neighbors_array(grid):
+    """
+    Array version of count_at_symbols_with_few_neighbors.
+    
+    Args:
+        grid: 2D boolean array from read_grid or to_grid
+        
+    Returns:
+        int: Count of '@' symbols with less than 4 neighbors
+    """
+    return int(np.count_nonzero(grid & (neighbor_counts(grid) < NEIGHBOR_THRESHOLD)))
+
+
+# Maps '@' to '1' and every other byte to '0' so a line can be parsed as binary
+_BIT_TABLE = bytes(ord('1') if byte == ord('@') else ord('0') for byte in range(256))
+
+
+def _row_to_bits(line):
+    """Packs one line into an int with bit j set where column j holds '@'."""
+    return int(line.translate(_BIT_TABLE)[::-1], 2) if line else 0
+
+
+def _add_plane(planes, bits):
+    """Adds a one-bit-per-cell mask into bit-sliced counters (planes[k] holds bit k of each count)."""
+    for k in range(len(planes)):
+        carry = planes[k] & bits
+        planes[k] ^= bits
+        bits = carry
+        if not bits:
+            return
+
+
+def _few_neighbor_masks(rows, width, above=0, below=0):
+    """
+    Returns, for each packed row, the mask of '@' cells with fewer than 4 neighbors.
+    
+    The eight shifted neighbor masks are summed with bit-sliced adders, so every column
+    of a row is counted in the same few integer operations. above and below are the
+    rows just outside rows, or 0 at the grid edge.
+    """
+    full = (1 << width) - 1
+    padded = [above] + rows + [below]
+    masks = []
+    for i, row in enumerate(rows):
+        up, down = padded[i], padded[i + 2]
+        planes = [0, 0, 0, 0]
+        for neighbors in (up, up << 1, up >> 1, row << 1, row >> 1, down, down << 1, down >> 1):
+            _add_plane(planes, neighbors & full)
+        # A count below 4 has both the 4s and 8s bits clear
+        masks.append(row & ~(planes[2] | planes[3]))
+    return masks
+
+
+class BitGrid:
+    """Compact grid that stores each row as a Python int, one bit per cell."""
+    
+    def __init__(self, rows, width):
+        self.rows = rows
+        self.width = width
+    
+    @classmethod
+    def from_matrix(cls, matrix):
+        """Packs a matrix of characters."""
+        rows = [_row_to_bits("".join(row).encode()) for row in matrix]
+        return cls(rows, len(matrix[0]) if matrix else 0)
+    
+    @classmethod
+    def from_file(cls, filename='input.txt'):
+        """Reads the input line by line straight into packed rows."""
+        rows = []
+        width = 0
+        with open(filename, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    width = max(width, len(line))
+                    rows.append(_row_to_bits(line))
+        return cls(rows, width)
+    
+    def count_few_neighbors(self):
+        """Bitboard version of count_at_symbols_with_few_neighbors."""
+        return sum(mask.bit_count() for mask in _few_neighbor_masks(self.rows, self.width))
+    
+    def count_few_neighbors_multiple(self):
+        """
+        Bitboard version of count_at_symbols_with_few_neighbors_multiple.
+        
+        Each round only recomputes rows next to a row that changed in the previous round.
+        """
+        rows = list(self.rows)
+        count = 0
+        dirty = set(range(len(rows)))
+        while dirty:
+            removals = {}
+            for i in sorted(dirty):
+                above = rows[i - 1] if i > 0 else 0
+                below = rows[i + 1] if i + 1 < len(rows) else 0
+                mask = _few_neighbor_masks([rows[i]], self.width, above, below)[0]
+                if mask:
+                    removals[i] = mask
+            dirty = set()
+            for i, mask in removals.items():
+                rows[i] &= ~mask
+                count += mask.bit_count()
+                dirty.update(j for j in (i - 1, i, i + 1) if 0 <= j < len(rows))
+        return count
+
+
+def _read_bands(filename, band_rows):
+    """Streams the input as lists of at most band_rows packed rows."""
+    band = []
+    with open(filename, 'rb') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                band.append(_row_to_bits(line))
+                if len(band) == band_rows:
+                    yield band
+                    band = []
+    if band:
+        yield band
+
+
+def _with_halos(bands):
+    """Yields (band, above, below) where above and below are the neighboring bands' edge rows."""
+    above = 0
+    previous = None
+    for band in bands:
+        if previous is not None:
+            yield previous, above, band[0]
+            above = previous[-1]
+        previous = band
+    if previous is not None:
+        yield previous, above, 0
+
+
+def _band_width(band, above, below):
+    """Number of columns needed to hold every '@' in a band and its halos."""
+    return max(row.bit_length() for row in (above, below, *band))
+
+
+def _band_few_neighbors(band, above, below):
+    """Worker entry point: count of '@' cells with few neighbors inside one band."""
+    masks = _few_neighbor_masks(band, _band_width(band, above, below), above, below)
+    return sum(mask.bit_count() for mask in masks)
+
+
+def _band_peel_round(band, above, below):
+    """Worker entry point: one removal round on a band, returning the new rows and the count removed."""
+    masks = _few_neighbor_masks(band, _band_width(band, above, below), above, below)
+    removed = sum(mask.bit_count() for mask in masks)
+    return [row & ~mask for row, mask in zip(band, masks)], removed
+
+
+def count_few_neighbors_tiled(filename='input.txt', band_rows=1024, workers=None):
+    """
+    Single-pass count computed band by band in a process pool.
+    
+    The grid is streamed from disk in bands of band_rows packed rows, each sent with a
+    one-row halo from its neighbors, and at most two bands per worker are in flight.
+    """
+    workers = workers or os.cpu_count() or 1
+    count = 0
+    with ProcessPoolExecutor(workers) as executor:
+        pending = deque()
+        for band, above, below in _with_halos(_read_bands(filename, band_rows)):
+            pending.append(executor.submit(_band_few_neighbors, band, above, below))
+            if len(pending) >= workers * 2:
+                count += pending.popleft().result()
+        count += sum(future.result() for future in pending)
+    return count
+
+
+def _band_peel_file(path, above, below):
+    """
+    Worker entry point: one removal round on the band stored at path, writing it back
+    if anything was removed. Returns the count removed and the band's edge rows.
+    """
+    with open(path, 'rb') as f:
+        band = pickle.load(f)
+    band, removed = _band_peel_round(band, above, below)
+    if removed:
+        with open(path, 'wb') as f:
+            pickle.dump(band, f)
+    return removed, band[0], band[-1]
+
+
+def count_few_neighbors_multiple_tiled(filename='input.txt', band_rows=1024, workers=None, scratch_dir=None):
+    """
+    Multi-round count computed band by band in a process pool.
+    
+    The grid is streamed from disk once and every band is written, bit-packed, to its
+    own file in a scratch directory. Workers read and rewrite band files themselves,
+    so the parent only keeps each band's first and last row in memory for the halos.
+    Every round reads all halos from the state at the start of the round, so the rounds
+    match count_at_symbols_with_few_neighbors_multiple. Only bands that changed, or border
+    one that did, are processed again, and the process stops once a round changes no band.
+    """
+    workers = workers or os.cpu_count() or 1
+    count = 0
+    with tempfile.TemporaryDirectory(dir=scratch_dir) as directory:
+        paths = []
+        edges = []
+        for band in _read_bands(filename, band_rows):
+            path = os.path.join(directory, f"band{len(paths)}.pickle")
+            with open(path, 'wb') as f:
+                pickle.dump(band, f)
+            paths.append(path)
+            edges.append((band[0], band[-1]))
+        
+        active = set(range(len(paths)))
+        with ProcessPoolExecutor(workers) as executor:
+            while active:
+                futures = {
+                    index: executor.submit(
+                        _band_peel_file,
+                        paths[index],
+                        edges[index - 1][1] if index > 0 else 0,
+                        edges[index + 1][0] if index + 1 < len(paths) else 0,
+                    )
+                    for index in sorted(active)
+                }
+                active = set()
+                for index, future in futures.items():
+                    removed, first, last = future.result()
+                    if removed:
+                        edges[index] = (first, last)
+                        count += removed
+                        active.update(i for i in (index - 1, index, index + 1) if 0 <= i < len(paths))
+    return count
+
+
 def main():
     matrix = read_input()
     print("Hello from day4!")
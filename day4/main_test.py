@@ -0,0 +1,146 @@
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+from main import (
+    BitGrid,
+    PeelDepthMap,
+    _peel_rounds,
+    count_at_symbols_with_few_neighbors,
+    count_at_symbols_with_few_neighbors_multiple,
+    count_at_symbols_with_few_neighbors_array,
+    count_few_neighbors_multiple_tiled,
+    count_few_neighbors_tiled,
+    neighbor_counts,
+    read_grid,
+    to_grid,
+)
+
+
+def rescan_rounds(matrix):
+    """The original full-rescan rounds: how many symbols each round removes."""
+    matrix = [row[:] for row in matrix]
+    rows, cols = len(matrix), len(matrix[0])
+    counts = []
+    while True:
+        removed = [
+            (i, j) for i in range(rows) for j in range(cols)
+            if matrix[i][j] == '@' and sum(
+                1 for di in (-1, 0, 1) for dj in (-1, 0, 1)
+                if (di or dj) and 0 <= i + di < rows and 0 <= j + dj < cols and matrix[i + di][j + dj] == '@'
+            ) < 4
+        ]
+        if not removed:
+            return counts
+        for i, j in removed:
+            matrix[i][j] = 'x'
+        counts.append(len(removed))
+
+
+def random_matrix(rng, rows, cols):
+    return [[rng.choice('@@@.') for _ in range(cols)] for _ in range(rows)]
+
+
+class Tests(unittest.TestCase):
+    def test_peel_rounds_match_rescan(self):
+        rng = random.Random(1)
+        matrices = [random_matrix(rng, rng.randint(1, 15), rng.randint(1, 15)) for _ in range(100)]
+        matrices += [random_matrix(rng, 1, 20), random_matrix(rng, 20, 1), [['@'] * 12 for _ in range(9)]]
+        for matrix in matrices:
+            expected = rescan_rounds(matrix)
+            assert [len(removed) for removed in _peel_rounds(matrix)] == expected
+            assert count_at_symbols_with_few_neighbors_multiple(matrix) == sum(expected)
+
+    def test_peel_depth_map_updates(self):
+        rng = random.Random(2)
+        for _ in range(100):
+            rows, cols = rng.randint(1, 12), rng.randint(1, 12)
+            matrix = random_matrix(rng, rows, cols)
+            depths = PeelDepthMap(matrix)
+            assert depths.removed_count() == count_at_symbols_with_few_neighbors_multiple(matrix)
+            for _ in range(10):
+                i, j = rng.randrange(rows), rng.randrange(cols)
+                add = matrix[i][j] != '@'
+                matrix[i][j] = '@' if add else '.'
+                depths.set_roll(i, j, add)
+                assert depths.depth_map() == PeelDepthMap(matrix).depth_map()
+                assert depths.removed_count() == count_at_symbols_with_few_neighbors_multiple(matrix)
+
+    def test_peel_depth_map_closing_a_ring(self):
+        # Re-adding the cut cell turns the ring back into a block that is never removed
+        n = 60
+        matrix = [['@' if min(i, j, n - 1 - i, n - 1 - j) < 2 else '.' for j in range(n)] for i in range(n)]
+        depths = PeelDepthMap(matrix)
+        for i in (0, 1):
+            matrix[i][n // 2] = '.'
+            depths.set_roll(i, n // 2, False)
+        assert depths.depth_map() == PeelDepthMap(matrix).depth_map()
+        matrix[1][n // 2] = '@'
+        depths.set_roll(1, n // 2, True)
+        assert depths.depth_map() == PeelDepthMap(matrix).depth_map()
+
+    def test_tiled_counts(self):
+        rng = random.Random(3)
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'input.txt')
+            for _ in range(10):
+                matrix = random_matrix(rng, rng.randint(1, 30), rng.randint(1, 40))
+                with open(filename, 'w') as f:
+                    f.write('\n'.join(''.join(row) for row in matrix) + '\n')
+                band_rows = rng.randint(1, 7)
+                assert count_few_neighbors_tiled(filename, band_rows, workers=2) == count_at_symbols_with_few_neighbors(matrix)
+                assert count_few_neighbors_multiple_tiled(filename, band_rows, workers=2, scratch_dir=directory) == \
+                    count_at_symbols_with_few_neighbors_multiple(matrix)
+
+    def test_array_counts(self):
+        rng = random.Random(4)
+        matrices = [random_matrix(rng, rng.randint(1, 15), rng.randint(1, 15)) for _ in range(50)]
+        matrices += [random_matrix(rng, 1, 20), random_matrix(rng, 20, 1), []]
+        for matrix in matrices:
+            grid = to_grid(matrix)
+            assert grid.tolist() == [[cell == '@' for cell in row] for row in matrix]
+            assert count_at_symbols_with_few_neighbors_array(grid) == count_at_symbols_with_few_neighbors(matrix)
+
+        matrix = random_matrix(rng, 6, 7)
+        counts = neighbor_counts(to_grid(matrix))
+        for i in range(6):
+            for j in range(7):
+                assert counts[i, j] == sum(
+                    1 for di in (-1, 0, 1) for dj in (-1, 0, 1)
+                    if (di or dj) and 0 <= i + di < 6 and 0 <= j + dj < 7 and matrix[i + di][j + dj] == '@'
+                )
+
+    def test_read_grid(self):
+        rng = random.Random(5)
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'input.txt')
+            for matrix in [random_matrix(rng, 9, 13), random_matrix(rng, 1, 20), random_matrix(rng, 20, 1)]:
+                with open(filename, 'w') as f:
+                    f.write('\n'.join(''.join(row) for row in matrix) + '\n')
+                assert np.array_equal(read_grid(filename), to_grid(matrix))
+            open(filename, 'w').close()
+            assert read_grid(filename).shape == (0, 0)
+
+    def test_bit_grid_counts(self):
+        rng = random.Random(6)
+        matrices = [random_matrix(rng, rng.randint(1, 15), rng.randint(1, 70)) for _ in range(50)]
+        # Trailing '.' columns must not change the counts of the packed rows
+        matrices += [[row + ['.'] * 5 for row in random_matrix(rng, 8, 10)], [['.'] * 6 for _ in range(3)]]
+        matrices += [random_matrix(rng, 1, 20), random_matrix(rng, 20, 1)]
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'input.txt')
+            for matrix in matrices:
+                with open(filename, 'w') as f:
+                    f.write('\n'.join(''.join(row) for row in matrix) + '\n')
+                expected = count_at_symbols_with_few_neighbors(matrix)
+                expected_multiple = count_at_symbols_with_few_neighbors_multiple(matrix)
+                for grid in (BitGrid.from_matrix(matrix), BitGrid.from_file(filename)):
+                    assert grid.count_few_neighbors() == expected
+                    assert grid.count_few_neighbors_multiple() == expected_multiple
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,10 @@
+import sys
+from bisect import bisect_left, bisect_right
+from collections import Counter
+
+import numpy as np
+
+
 def read_input(filename='input.txt'):
     """
     Reads input.txt and returns the contents.
@@ -25,64 +32,46 @@ def read_input(filename='input.txt'):
     return ranges, numbers
 
 
-def filter_numbers_in_ranges(ranges, numbers):
+def read_input_array(filename='input.txt'):
     """
-    Takes a list of ranges and a list of numbers as input and returns
-    a list of numbers that are present in at least one of the ranges.
-    
-    Args:
-        ranges: List of range strings in format "start|end"
-        numbers: List of number strings
-    
-    Returns:
-        List of numbers that fall within at least one range
+    Like read_input, but parses the list of numbers straight into an int64
+    array instead of a list of strings.
+    Returns a tuple: (ranges, numbers)
     """
-    result = []
+    with open(filename, 'rb') as f:
+        # Normalize line endings so CRLF files split like read_input's text mode
+        content = f.read().replace(b'\r\n', b'\n').strip()
     
-    # Parse ranges into tuples of (start, end)
+    range_part, _, number_part = content.partition(b'\n\n')
+    ranges = range_part.decode().split()
+    numbers = np.fromstring(number_part, dtype=np.int64, sep=' ')
+    return ranges, numbers
+
+
+def parse_ranges(ranges):
+    """
+    Parses range strings in format "start-end" into a list of (start, end) tuples.
+    """
     parsed_ranges = []
     for range_str in ranges:
         start, end = map(int, range_str.split('-'))
         parsed_ranges.append((start, end))
-    
-    # Check each number against all ranges
-    for num_str in numbers:
-        num = int(num_str)
-        for start, end in parsed_ranges:
-            if start <= num <= end:
-                result.append(num_str)
-                break  # No need to check other ranges once found
-    
-    return result
+    return parsed_ranges
 
-def count_numbers_in_ranges(ranges):
+
+def merge_ranges(parsed_ranges):
     """
-    Takes a list of ranges and returns the count of unique numbers that fall
-    within at least one of the ranges.
-    
-    Args:
-        ranges: List of range strings in format "start|end"
-    
-    Returns:
-        Integer count of unique numbers covered by the ranges
+    Sorts (start, end) tuples and merges the ones that overlap or are adjacent.
     
     Example:
-        ranges = ["3-5", "10-14", "16-20", "12-18"]
-        Returns 14 (numbers: 3,4,5,10,11,12,13,14,16,17,18,19,20 = 13 unique, but overlapping ranges merge)
+        [(10, 14), (3, 5), (16, 20), (12, 18)] returns [(3, 5), (10, 20)]
     """
-    if not ranges:
-        return 0
-    
-    # Parse ranges into tuples of (start, end)
-    parsed_ranges = []
-    for range_str in ranges:
-        start, end = map(int, range_str.split('-'))
-        parsed_ranges.append((start, end))
+    if not parsed_ranges:
+        return []
     
     # Sort ranges by start position
-    parsed_ranges.sort()
+    parsed_ranges = sorted(parsed_ranges)
     
-    # Merge overlapping ranges and count total numbers
     merged_ranges = []
     current_start, current_end = parsed_ranges[0]
     
@@ -97,14 +86,280 @@ def count_numbers_in_ranges(ranges):
     
     # Don't forget the last range
     merged_ranges.append((current_start, current_end))
+    return merged_ranges
+
+
+class IntervalIndex:
+    """
+    Merged ranges kept as parallel sorted start/end lists, so that checking a
+    number is a binary search instead of a scan over every range.
+    
+    An index can also sit directly on int64 start/end arrays (see from_arrays),
+    for example the rows of a memory-mapped index file.
+    """
+    
+    def __init__(self, merged_ranges=(), arrays=None):
+        if arrays is not None:
+            self.starts, self.ends = arrays
+        else:
+            self.starts = [start for start, _ in merged_ranges]
+            self.ends = [end for _, end in merged_ranges]
+        self._arrays = arrays
+    
+    @classmethod
+    def from_ranges(cls, ranges):
+        """Builds the index from range strings in format "start-end"."""
+        return cls(merge_ranges(parse_ranges(ranges)))
+    
+    @classmethod
+    def from_arrays(cls, starts, ends):
+        """Builds the index over sorted, merged int64 start and end arrays without copying them."""
+        return cls(arrays=(starts, ends))
+    
+    def __len__(self):
+        return len(self.starts)
+    
+    def __contains__(self, num):
+        i = bisect_right(self.starts, num) - 1
+        return bool(i >= 0 and num <= self.ends[i])
+    
+    def count(self):
+        """Total count of numbers covered by the ranges."""
+        if isinstance(self.starts, np.ndarray):
+            return int((self.ends - self.starts + 1).sum())
+        return sum(end - start + 1 for start, end in zip(self.starts, self.ends))
+    
+    def as_arrays(self):
+        """The start and end lists as int64 arrays, built on first use."""
+        if self._arrays is None:
+            self._arrays = (np.array(self.starts, dtype=np.int64), np.array(self.ends, dtype=np.int64))
+        return self._arrays
+    
+    def contains_array(self, ids):
+        """
+        Boolean mask of which ids fall within a range, classifying the whole
+        array with one searchsorted call.
+        """
+        starts, ends = self.as_arrays()
+        if not len(starts):
+            return np.zeros(len(ids), dtype=bool)
+        i = np.searchsorted(starts, ids, side='right') - 1
+        return (i >= 0) & (ids <= ends[np.maximum(i, 0)])
+    
+    def count_array(self, ids):
+        """Number of ids that fall within a range."""
+        return int(np.count_nonzero(self.contains_array(ids)))
+
+
+class IntervalSet(IntervalIndex):
+    """
+    IntervalIndex that can change: ranges can be added and removed without
+    re-sorting and re-merging everything.
+    
+    Each change finds the affected merged ranges with two binary searches and
+    splices in their merged or split replacement, and the covered count is kept
+    as a running total.
+    """
+    
+    def __init__(self, merged_ranges=()):
+        super().__init__(merged_ranges)
+        self._covered = super().count()
+    
+    @classmethod
+    def from_arrays(cls, starts, ends):
+        """Builds an editable set from sorted, merged start and end arrays, copying them into lists."""
+        return cls(list(zip(np.asarray(starts).tolist(), np.asarray(ends).tolist())))
+    
+    def count(self):
+        """Total count of numbers covered by the ranges."""
+        return self._covered
+    
+    def add(self, start, end):
+        """Covers start..end (inclusive), merging with overlapping or adjacent ranges."""
+        if start > end:
+            return
+        lo = bisect_left(self.ends, start - 1)
+        hi = bisect_right(self.starts, end + 1)
+        if lo < hi:
+            start = min(start, self.starts[lo])
+            end = max(end, self.ends[hi - 1])
+        self._splice(lo, hi, [(start, end)])
+    
+    def remove(self, start, end):
+        """Uncovers start..end (inclusive), splitting a range that only partly overlaps."""
+        if start > end:
+            return
+        lo = bisect_left(self.ends, start)
+        hi = bisect_right(self.starts, end)
+        if lo >= hi:
+            return
+        pieces = []
+        if self.starts[lo] < start:
+            pieces.append((self.starts[lo], start - 1))
+        if self.ends[hi - 1] > end:
+            pieces.append((end + 1, self.ends[hi - 1]))
+        self._splice(lo, hi, pieces)
     
-    # Count total numbers in merged ranges
-    total_count = 0
-    for start, end in merged_ranges:
-        total_count += (end - start + 1)
+    def _splice(self, lo, hi, pieces):
+        """Replaces merged ranges lo..hi-1 with pieces and updates the covered count."""
+        self._covered -= sum(self.ends[i] - self.starts[i] + 1 for i in range(lo, hi))
+        self._covered += sum(end - start + 1 for start, end in pieces)
+        self.starts[lo:hi] = [start for start, _ in pieces]
+        self.ends[lo:hi] = [end for _, end in pieces]
+        self._arrays = None
+
+
+class CoverageProfile:
+    """
+    How many ranges cover each number, found by sweeping over the sorted range
+    endpoints without expanding any range.
+    
+    points holds the numbers where the coverage changes and depths[i] is the
+    coverage from points[i] up to the next point.
+    """
+    
+    def __init__(self, parsed_ranges):
+        changes = Counter()
+        for start, end in parsed_ranges:
+            changes[start] += 1
+            changes[end + 1] -= 1
+        self.points = sorted(changes)
+        self.depths = []
+        depth = 0
+        for point in self.points:
+            depth += changes[point]
+            self.depths.append(depth)
+    
+    @classmethod
+    def from_ranges(cls, ranges):
+        """Builds the profile from range strings in format "start-end"."""
+        return cls(parse_ranges(ranges))
+    
+    def depth(self, num):
+        """Number of ranges that contain num."""
+        i = bisect_right(self.points, num) - 1
+        return self.depths[i] if i >= 0 else 0
+    
+    def histogram(self):
+        """
+        Maps each coverage depth k >= 1 to how many numbers are covered by exactly
+        k ranges.
+        
+        Example:
+            ranges = ["3-5", "10-14", "16-20", "12-18"]
+            Returns {1: 8, 2: 6}
+        """
+        histogram = Counter()
+        for point, next_point, depth in zip(self.points, self.points[1:], self.depths):
+            if depth:
+                histogram[depth] += next_point - point
+        return dict(sorted(histogram.items()))
+
+
+def _as_index(ranges):
+    """Accepts either range strings or an already built IntervalIndex."""
+    return ranges if isinstance(ranges, IntervalIndex) else IntervalIndex.from_ranges(ranges)
+
+
+def filter_numbers_in_ranges(ranges, numbers):
+    """
+    Takes a list of ranges and a list of numbers as input and returns
+    a list of numbers that are present in at least one of the ranges.
+    
+    Args:
+        ranges: List of range strings in format "start|end", or an IntervalIndex
+        numbers: List of number strings
+    
+    Returns:
+        List of numbers that fall within at least one range
+    """
+    index = _as_index(ranges)
+    return [num_str for num_str in numbers if int(num_str) in index]
+
+def count_numbers_in_ranges(ranges):
+    """
+    Takes a list of ranges and returns the count of unique numbers that fall
+    within at least one of the ranges.
+    
+    Args:
+        ranges: List of range strings in format "start|end", or an IntervalIndex
     
-    return total_count
+    Returns:
+        Integer count of unique numbers covered by the ranges
+    
+    Example:
+        ranges = ["3-5", "10-14", "16-20", "12-18"]
+        Returns 14 (numbers: 3,4,5,10,11,12,13,14,16,17,18,19,20 = 13 unique, but overlapping ranges merge)
+    """
+    if not ranges:
+        return 0
+    
+    return _as_index(ranges).count()
+
+
+
+def compile_index(ranges, path):
+    """
+    Merges the ranges and writes them to path as a (2, n) int64 .npy file of
+    starts and ends that load_index can memory-map.
+    """
+    index = _as_index(ranges)
+    np.save(path, np.array([index.starts, index.ends], dtype=np.int64).reshape(2, -1))
+
 
+def load_index(path):
+    """Memory-maps an index written by compile_index, without parsing or sorting anything."""
+    data = np.load(path, mmap_mode='r')
+    return IntervalIndex.from_arrays(data[0], data[1])
+
+
+def _read_blocks(source, block_size):
+    """Yields blocks of about block_size bytes from a binary stream, each ending on a line boundary."""
+    while block := source.read(block_size):
+        yield block + source.readline()
+
+
+def query_stream(index, source='-', block_size=1 << 20):
+    """
+    Checks IDs read from a file, or stdin for '-', against an index one block at a time.
+    
+    Args:
+        index: IntervalIndex, e.g. from load_index
+        source: Filename of IDs (one per line), '-' for stdin, or a binary stream
+        block_size: Bytes read per block, which bounds memory use
+    
+    Returns:
+        Generator of (ids, mask) array pairs, one per block
+    """
+    if source == '-':
+        source = sys.stdin.buffer
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            yield from query_stream(index, f, block_size)
+        return
+    for block in _read_blocks(source, block_size):
+        ids = np.fromstring(block, dtype=np.int64, sep=' ')
+        yield ids, index.contains_array(ids)
+
+
+def count_fresh_stream(index, source='-', block_size=1 << 20):
+    """Number of IDs from query_stream's source that fall within a range."""
+    return sum(int(np.count_nonzero(mask)) for _, mask in query_stream(index, source, block_size))
+
+
+def run_command(args):
+    """
+    Command line entry point:
+        compile INPUT INDEX      writes the ranges section of INPUT as an index file
+        query INDEX [IDS|-]      prints how many IDs (default: stdin) are fresh
+    """
+    if len(args) == 3 and args[0] == 'compile':
+        ranges, _ = read_input(args[1])
+        compile_index(ranges, args[2])
+    elif len(args) in (2, 3) and args[0] == 'query':
+        print(count_fresh_stream(load_index(args[1]), args[2] if len(args) == 3 else '-'))
+    else:
+        raise SystemExit(run_command.__doc__)
 
 
 def main():
@@ -113,10 +368,15 @@ def main():
     print(f"Ranges: {ranges}")
     print(f"Numbers: {numbers}")
     
-    filtered_numbers = filter_numbers_in_ranges(ranges, numbers)
+    # Parse and merge the ranges once for both parts
+    index = IntervalIndex.from_ranges(ranges)
+    filtered_numbers = filter_numbers_in_ranges(index, numbers)
     print(f"Filtered numbers: {len(filtered_numbers)}")
-    print(f"Total fresh: {count_numbers_in_ranges(ranges)}")
+    print(f"Total fresh: {count_numbers_in_ranges(index)}")
 
 
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1:
+        run_command(sys.argv[1:])
+    else:
+        main()
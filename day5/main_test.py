@@ -0,0 +1,98 @@
+import os
+import random
+import tempfile
+import unittest
+from collections import Counter
+
+import numpy as np
+
+from main import (
+    CoverageProfile,
+    IntervalIndex,
+    IntervalSet,
+    compile_index,
+    count_numbers_in_ranges,
+    load_index,
+    read_input,
+    read_input_array,
+)
+
+
+def random_ranges(rng, count):
+    ranges = []
+    for _ in range(count):
+        start = rng.randint(0, 100)
+        ranges.append(f"{start}-{start + rng.randint(0, 20)}")
+    return ranges
+
+
+class Tests(unittest.TestCase):
+    def test_interval_set_add_remove(self):
+        rng = random.Random(1)
+        for _ in range(100):
+            intervals = IntervalSet()
+            expected = set()
+            for _ in range(40):
+                start = rng.randint(0, 60)
+                end = start + rng.randint(-2, 15)
+                if rng.random() < 0.6:
+                    intervals.add(start, end)
+                    expected |= set(range(start, end + 1))
+                else:
+                    intervals.remove(start, end)
+                    expected -= set(range(start, end + 1))
+                assert intervals.count() == len(expected)
+                assert all((num in intervals) == (num in expected) for num in range(-2, 80))
+                # Adjacent ranges must end up merged, never as separate touching pieces
+                assert all(intervals.starts[i + 1] > intervals.ends[i] + 1 for i in range(len(intervals) - 1))
+
+    def test_interval_set_from_arrays(self):
+        index = IntervalIndex.from_ranges(["3-5", "10-14", "16-20", "12-18"])
+        intervals = IntervalSet.from_arrays(*index.as_arrays())
+        assert (intervals.starts, intervals.ends, intervals.count()) == ([3, 10], [5, 20], 14)
+        intervals.add(6, 9)
+        intervals.remove(15, 15)
+        assert (intervals.starts, intervals.ends, intervals.count()) == ([3, 16], [14, 20], 17)
+        assert 15 not in intervals and 16 in intervals
+
+    def test_coverage_profile(self):
+        assert CoverageProfile.from_ranges(["3-5", "10-14", "16-20", "12-18"]).histogram() == {1: 8, 2: 6}
+        rng = random.Random(2)
+        for _ in range(100):
+            ranges = random_ranges(rng, rng.randint(0, 8))
+            profile = CoverageProfile.from_ranges(ranges)
+            coverage = Counter(
+                num for start, end in (map(int, r.split('-')) for r in ranges) for num in range(start, end + 1)
+            )
+            assert all(profile.depth(num) == coverage[num] for num in range(-2, 130))
+            assert profile.histogram() == dict(sorted(Counter(coverage.values()).items()))
+
+    def test_contains_array(self):
+        rng = random.Random(3)
+        for _ in range(100):
+            ranges = random_ranges(rng, rng.randint(0, 8))
+            index = IntervalIndex.from_ranges(ranges)
+            ids = np.arange(-5, 130)
+            assert index.contains_array(ids).tolist() == [int(num) in index for num in ids]
+
+    def test_read_input_array_crlf(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'input.txt')
+            with open(filename, 'wb') as f:
+                f.write(b"3-5\r\n10-14\r\n\r\n1\r\n5\r\n11\r\n")
+            ranges, numbers = read_input_array(filename)
+            assert (ranges, numbers.tolist()) == (read_input(filename)[0], [1, 5, 11])
+
+    def test_compiled_index(self):
+        ranges = ["3-5", "10-14", "16-20", "12-18"]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'index.npy')
+            compile_index(ranges, path)
+            index = load_index(path)
+            assert type(index.count()) is int
+            assert count_numbers_in_ranges(index) == count_numbers_in_ranges(ranges) == 14
+            assert [num in index for num in (2, 3, 15, 20, 21)] == [False, True, True, True, False]
+
+
+if __name__ == "__main__":
+    unittest.main()